@@ -1,97 +1,141 @@
 """
 Phase 1: API endpoint discovery via Playwright network interception.
-Opens the ACP scan page and agent detail page, captures all API calls.
+Opens the ACP scan page and agent detail page concurrently in one browser,
+captures all API calls.
 """
 
 import asyncio
 import json
 import re
+import sys
 from datetime import datetime
-from playwright.async_api import async_playwright, Response
+from typing import Optional
+
+from playwright.async_api import async_playwright, Browser, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 API_PATTERNS = re.compile(
     r"(api|graphql|agents|leaderboard|agdp|metrics|scan|acp|claw)", re.IGNORECASE
 )
 SKIP_EXTENSIONS = re.compile(r"\.(js|css|png|jpg|jpeg|gif|svg|ico|woff2?|ttf|eot|map)(\?|$)")
+FIRST_API_TIMEOUT_SEC = 10
+TRAILING_CAPTURE_MS = 1000
 
 
-async def capture_api_calls(url: str, label: str, timeout_ms: int = 30000):
-    """Visit a URL and capture all API-like network responses."""
+async def capture_api_calls(browser: Browser, url: str, label: str, timeout_ms: int = 30000):
+    """Visit a URL in a new page of `browser` and capture all API-like network responses.
+
+    Returns shortly after the first API response arrives (plus a short tail
+    for follow-up calls) instead of waiting for network idle.
+    """
     captured = []
+    api_seen = asyncio.Event()
 
     async def on_response(response: Response):
+        # Cheapest rejects first: content-type substring, then the URL regexes.
+        # A substring test keeps vendor types (application/vnd.api+json, text/json).
         req_url = response.url
-        if SKIP_EXTENSIONS.search(req_url):
-            return
         content_type = response.headers.get("content-type", "")
-        if "json" not in content_type and "graphql" not in req_url:
+        if "json" not in content_type.lower() and "graphql" not in req_url:
             return
+        if SKIP_EXTENSIONS.search(req_url) or not API_PATTERNS.search(req_url):
+            return
+        # Only a preview is kept, so slice the raw body instead of parsing
+        # and re-serializing it.
         try:
-            body = await response.json()
+            raw = await response.body()
+            body_preview = raw[:2000].decode("utf-8", "replace")
         except Exception:
-            body = "(failed to parse)"
+            body_preview = "(failed to read body)"
         captured.append({
             "url": req_url,
             "method": response.request.method,
             "status": response.status,
             "content_type": content_type,
-            "body_preview": json.dumps(body, ensure_ascii=False)[:2000] if isinstance(body, (dict, list)) else str(body)[:500],
+            "body_preview": body_preview,
         })
+        api_seen.set()
+
+    page = await browser.new_page()
+    page.on("response", on_response)
+
+    print(f"\n[{label}] Loading {url} ...")
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+        await asyncio.wait_for(api_seen.wait(), timeout=FIRST_API_TIMEOUT_SEC)
+        await page.wait_for_timeout(TRAILING_CAPTURE_MS)
+    except asyncio.TimeoutError:
+        print(f"  Warning: no API response within {FIRST_API_TIMEOUT_SEC}s of page load")
+    except Exception as e:
+        print(f"  Warning: page load issue - {e}")
+    finally:
+        await page.close()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        page.on("response", on_response)
+    return captured
 
-        print(f"\n[{label}] Loading {url} ...")
-        try:
-            await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
-            await page.wait_for_timeout(5000)
-        except Exception as e:
-            print(f"  Warning: page load issue - {e}")
 
-        await browser.close()
+def _write_json(path: str, obj) -> None:
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
 
-    return captured
+
+async def _capture_pages(browser: Browser):
+    return await asyncio.gather(
+        capture_api_calls(
+            browser, "https://app.virtuals.io/acp/scan", "SCAN PAGE", timeout_ms=45000
+        ),
+        capture_api_calls(
+            browser, "https://app.virtuals.io/acp/agent-details/84", "AGENT DETAIL", timeout_ms=45000
+        ),
+    )
 
 
-async def discover():
-    """Discover API endpoints from scan and agent-detail pages."""
+async def discover(browser: Optional[Browser] = None):
+    """Discover API endpoints from scan and agent-detail pages.
+
+    Pass an already-launched `browser` to reuse it across runs; otherwise a
+    headless Chromium is launched and closed for this call.
+    """
     print("=" * 70)
     print("Virtuals ACP - API Endpoint Discovery")
     print(f"Time: {datetime.now().isoformat()}")
     print("=" * 70)
 
-    scan_apis = await capture_api_calls(
-        "https://app.virtuals.io/acp/scan", "SCAN PAGE", timeout_ms=45000
-    )
-    detail_apis = await capture_api_calls(
-        "https://app.virtuals.io/acp/agent-details/84", "AGENT DETAIL", timeout_ms=45000
-    )
+    if browser is not None:
+        scan_apis, detail_apis = await _capture_pages(browser)
+    else:
+        async with async_playwright() as p:
+            owned_browser = await p.chromium.launch(headless=True)
+            try:
+                scan_apis, detail_apis = await _capture_pages(owned_browser)
+            finally:
+                await owned_browser.close()
 
     all_results = {"scan_page": scan_apis, "agent_detail_page": detail_apis}
 
-    print("\n" + "=" * 70)
-    print(f"SCAN PAGE: captured {len(scan_apis)} API calls")
-    print("=" * 70)
-    for i, api in enumerate(scan_apis, 1):
-        print(f"\n--- [{i}] {api['method']} {api['status']} ---")
-        print(f"URL: {api['url']}")
-        print(f"Type: {api['content_type']}")
-        print(f"Body: {api['body_preview'][:500]}")
-
-    print("\n" + "=" * 70)
-    print(f"AGENT DETAIL PAGE: captured {len(detail_apis)} API calls")
-    print("=" * 70)
-    for i, api in enumerate(detail_apis, 1):
-        print(f"\n--- [{i}] {api['method']} {api['status']} ---")
-        print(f"URL: {api['url']}")
-        print(f"Type: {api['content_type']}")
-        print(f"Body: {api['body_preview'][:500]}")
+    lines = []
+    for title, apis in (("SCAN PAGE", scan_apis), ("AGENT DETAIL PAGE", detail_apis)):
+        lines += ["", "=" * 70, f"{title}: captured {len(apis)} API calls", "=" * 70]
+        for i, api in enumerate(apis, 1):
+            lines += [
+                "",
+                f"--- [{i}] {api['method']} {api['status']} ---",
+                f"URL: {api['url']}",
+                f"Type: {api['content_type']}",
+                f"Body: {api['body_preview'][:500]}",
+            ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     out_path = "output/api_discovery.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(all_results, f, ensure_ascii=False, indent=2)
+    await asyncio.to_thread(_write_json, out_path, all_results)
     print(f"\nFull results saved to {out_path}")
 
     return all_results
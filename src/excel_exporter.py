@@ -5,13 +5,19 @@ Headers in English, content in Chinese where applicable.
 
 import os
 from datetime import datetime
-from typing import List
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Tuple
+from zipfile import ZIP_DEFLATED, ZipFile
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.writer.excel import ExcelWriter
 
 from .models import AgentData, GlobalMetrics, Offering
+from .xlsx_writer import CellStyle, write_xlsx
 
 HEADER_STRUCTURE = [
     # (level1_name, [(level2_name, field_key), ...])
@@ -73,71 +79,269 @@ THIN_BORDER = Border(
     top=Side(style="thin", color="B4C6E7"),
     bottom=Side(style="thin", color="B4C6E7"),
 )
+CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+CENTER_WRAP_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+DATA_ALIGN = Alignment(vertical="top", wrap_text=True)
+SUMMARY_LABEL_FONT = Font(bold=True, size=10)
+MAX_COL_WIDTH = 40
+# Sheet layout: summary on rows 1-3, then L1/L2 headers, then one row per
+# agent. Keeping the summary on top lets every range be computed up front.
+L1_HEADER_ROW = 4
+L2_HEADER_ROW = 5
+DATA_START_ROW = 6
+# Sheet XML is highly redundant, so level 1 deflate costs little in size
+# and is several times faster than the default level 6.
+ZIP_COMPRESSLEVEL = 1
 
 
-def _format_offerings_field(offerings: List[Offering], field: str) -> str:
+OFFERING_KEYS = ("offering_names", "offering_descs", "offering_prices", "offering_sla", "offering_reqs")
+
+# Pre-bound formatters for the per-offering lines
+_ITEM_FMT = "{}. {}".format
+_PCT_PRICE_FMT = "{}. {:.1f}% (按比例)".format
+_FIXED_PRICE_FMT = "{}. ${:.2f} USDC (固定价格)".format
+_SLA_FMT = "{}. {} 分钟".format
+
+
+def _format_all_offerings(offerings: List[Offering]) -> Dict[str, str]:
+    """Format all five offering columns in a single pass over the offerings."""
     if not offerings:
-        return "无"
-    lines = []
+        return dict.fromkeys(OFFERING_KEYS, "无")
+    names, descs, prices, sla, reqs = [], [], [], [], []
     for i, o in enumerate(offerings, 1):
-        if field == "names":
-            lines.append(f"{i}. {o.name}")
-        elif field == "descs":
-            lines.append(f"{i}. {o.description}" if o.description else f"{i}. 无描述")
-        elif field == "prices":
-            if o.price_type == "percentage":
-                lines.append(f"{i}. {o.price * 100:.1f}% (按比例)")
-            else:
-                lines.append(f"{i}. ${o.price:.2f} USDC (固定价格)")
-        elif field == "sla":
-            lines.append(f"{i}. {o.sla_minutes} 分钟")
-        elif field == "reqs":
-            lines.append(f"{i}. {o.requirement}" if o.requirement else f"{i}. 无要求")
-    return "\n".join(lines)
+        names.append(_ITEM_FMT(i, o.name))
+        descs.append(_ITEM_FMT(i, o.description or "无描述"))
+        if o.price_type == "percentage":
+            prices.append(_PCT_PRICE_FMT(i, o.price * 100))
+        else:
+            prices.append(_FIXED_PRICE_FMT(i, o.price))
+        sla.append(_SLA_FMT(i, o.sla_minutes))
+        reqs.append(_ITEM_FMT(i, o.requirement or "无要求"))
+    return dict(zip(OFFERING_KEYS, map("\n".join, (names, descs, prices, sla, reqs))))
 
 
 LINK_FONT = Font(name="Arial", size=10, color="0563C1", underline="single")
 
 
-def _get_cell_value(agent: AgentData, key: str):
-    if key == "offering_names":
-        return _format_offerings_field(agent.offerings, "names")
-    elif key == "offering_descs":
-        return _format_offerings_field(agent.offerings, "descs")
-    elif key == "offering_prices":
-        return _format_offerings_field(agent.offerings, "prices")
-    elif key == "offering_sla":
-        return _format_offerings_field(agent.offerings, "sla")
-    elif key == "offering_reqs":
-        return _format_offerings_field(agent.offerings, "reqs")
-    elif key == "has_graduated":
-        return "是" if agent.has_graduated else "否"
-    elif key == "is_virtual_agent":
-        return "是" if agent.is_virtual_agent else "否"
-    elif key == "success_rate":
-        return agent.success_rate
-    elif key == "twitter_handle":
-        return f"@{agent.twitter_handle}" if agent.twitter_handle else ""
-    elif key == "agent_link":
-        return agent.agent_link
-    else:
-        return getattr(agent, key, "")
-
-
-def _auto_col_widths(ws, col_start: int, col_end: int, max_width: int = 40):
-    for col_idx in range(col_start, col_end + 1):
-        max_len = 0
-        col_letter = get_column_letter(col_idx)
-        for row in ws.iter_rows(min_col=col_idx, max_col=col_idx, min_row=2, max_row=min(ws.max_row, 50)):
-            for cell in row:
-                if cell.value:
-                    lines = str(cell.value).split("\n")
-                    line_max = max(len(line) for line in lines) if lines else 0
-                    max_len = max(max_len, line_max)
-        header_cell = ws.cell(row=2, column=col_idx)
-        if header_cell.value:
-            max_len = max(max_len, len(str(header_cell.value)))
-        ws.column_dimensions[col_letter].width = min(max(max_len + 3, 12), max_width)
+# Columns whose cell value is derived rather than read straight off AgentData.
+# Offering columns are not listed: they come from _format_all_offerings.
+FIELD_DISPATCH: Dict[str, Callable[[AgentData], Any]] = {
+    "has_graduated": lambda a: "是" if a.has_graduated else "否",
+    "is_virtual_agent": lambda a: "是" if a.is_virtual_agent else "否",
+    "twitter_handle": lambda a: f"@{a.twitter_handle}" if a.twitter_handle else "",
+}
+
+
+# Flattened column schema, resolved once at import time
+L2_NAMES = tuple(l2_name for _, fields in HEADER_STRUCTURE for l2_name, _ in fields)
+FLAT_KEYS = tuple(key for _, fields in HEADER_STRUCTURE for _, key in fields)
+TOTAL_COLS = len(FLAT_KEYS)
+LINK_COL = FLAT_KEYS.index("agent_link")
+
+# One attrgetter fetches every column's raw attribute in a single C call;
+# offering columns read `offerings` as a placeholder. Derived columns are
+# then overwritten in place by index.
+_ROW_GETTER = attrgetter(*("offerings" if key in OFFERING_KEYS else key for key in FLAT_KEYS))
+OFFERING_COLS = tuple((FLAT_KEYS.index(key), key) for key in OFFERING_KEYS)
+DISPATCH_COLS = tuple((FLAT_KEYS.index(key), getter) for key, getter in FIELD_DISPATCH.items())
+
+
+def _l1_layout() -> Tuple[tuple, tuple]:
+    """L1 header row values (None under merged spans) and the merge range strings."""
+    l1_row = []
+    merges = []
+    col = 1
+    for l1_name, l2_fields in HEADER_STRUCTURE:
+        end_col = col + len(l2_fields) - 1
+        l1_row.append(l1_name)
+        l1_row.extend([None] * (end_col - col))
+        if end_col > col:
+            merges.append(
+                f"{get_column_letter(col)}{L1_HEADER_ROW}:{get_column_letter(end_col)}{L1_HEADER_ROW}"
+            )
+        col = end_col + 1
+    return tuple(l1_row), tuple(merges)
+
+
+L1_ROW, MERGE_RANGES = _l1_layout()
+
+
+def _border_cell(ws) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws)
+    cell.border = THIN_BORDER
+    return cell
+
+
+def _styled_cell(ws, value, font, fill=None, alignment=None, border=None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    if border is not None:
+        cell.border = border
+    return cell
+
+
+def _text_width(value) -> int:
+    """Longest line length of a cell value as displayed."""
+    if not value:
+        return 0
+    return max(map(len, str(value).split("\n")))
+
+
+def _collect_rows(agents: List[AgentData]) -> Tuple[List[list], List[float]]:
+    """Build every data row's values and the resulting column widths."""
+    data_rows = []
+    for agent in agents:
+        values = list(_ROW_GETTER(agent))
+        offers = _format_all_offerings(agent.offerings)
+        for col, key in OFFERING_COLS:
+            values[col] = offers[key]
+        for col, getter in DISPATCH_COLS:
+            values[col] = getter(agent)
+        data_rows.append(values)
+
+    # Column-wise max() over map() keeps the width scan inside C builtins.
+    columns = zip(*data_rows) if data_rows else [()] * TOTAL_COLS
+    widths = [
+        max(len(name), max(map(_text_width, column), default=0))
+        for name, column in zip(L2_NAMES, columns)
+    ]
+    return data_rows, [min(max(w + 3, 12), MAX_COL_WIDTH) for w in widths]
+
+
+def _filter_ref(agent_count: int) -> str:
+    return f"A{L2_HEADER_ROW}:{get_column_letter(TOTAL_COLS)}{L2_HEADER_ROW + agent_count}"
+
+
+def _summary_items(global_metrics: GlobalMetrics) -> List[tuple]:
+    return [
+        ("爬取时间", global_metrics.scrape_time),
+        ("总 Agent 数量", global_metrics.total_agents),
+        ("平台总 AGDP", f"${global_metrics.total_agdp_latest:,.2f}"),
+    ]
+
+
+def _write_openpyxl(
+    filepath: str,
+    agents: List[AgentData],
+    data_rows: List[list],
+    widths: List[float],
+    global_metrics: GlobalMetrics,
+) -> None:
+    """Write via an openpyxl write-only workbook.
+
+    Rows are streamed to the sheet XML instead of being held as a cell grid,
+    so column widths, freeze panes and other sheet-level settings have to be
+    set before the first append.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("ACP Agents")
+
+    # -- Formatting (must precede the first append in write-only mode) --
+    for col_idx, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    ws.freeze_panes = f"A{DATA_START_ROW}"
+    ws.sheet_properties.filterMode = False
+    ws.auto_filter.ref = _filter_ref(len(agents))
+
+    # -- Rows 1-3: Summary --
+    for label, value in _summary_items(global_metrics):
+        ws.append([
+            _styled_cell(ws, label, SUMMARY_LABEL_FONT),
+            _styled_cell(ws, value, DATA_FONT),
+        ])
+
+    # -- Row 4: Level-1 headers (merged cells) --
+    # Excel draws a merged range's border from the cells on its edge, not just the
+    # top-left one, so the covered cells get a value-less border-only cell.
+    for ref in MERGE_RANGES:
+        ws.merged_cells.add(CellRange(ref))
+    ws.append([
+        _border_cell(ws) if name is None else _styled_cell(ws, name, L1_FONT, L1_FILL, CENTER_ALIGN, THIN_BORDER)
+        for name in L1_ROW
+    ])
+
+    # -- Row 5: Level-2 headers --
+    ws.append([
+        _styled_cell(
+            ws, l2_name, L2_FONT, L2_FILL,
+            CENTER_WRAP_ALIGN, THIN_BORDER,
+        )
+        for l2_name in L2_NAMES
+    ])
+
+    # -- Data rows (starting row 6) --
+    for agent, values in zip(agents, data_rows):
+        row = []
+        for col, value in enumerate(values):
+            if col == LINK_COL and agent.agent_link:
+                cell = _styled_cell(ws, agent.agent_link, LINK_FONT, alignment=DATA_ALIGN, border=THIN_BORDER)
+                cell.hyperlink = agent.agent_link
+            else:
+                cell = _styled_cell(ws, value, DATA_FONT, alignment=DATA_ALIGN, border=THIN_BORDER)
+            row.append(cell)
+        ws.append(row)
+
+    # Equivalent of wb.save(), but with fast deflate instead of zipfile's default level.
+    archive = ZipFile(filepath, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=ZIP_COMPRESSLEVEL)
+    ExcelWriter(wb, archive).save()
+
+
+# Style table for the direct-XML writer; indexes are referenced by _fast_rows.
+FAST_STYLES = (
+    CellStyle(font=L1_FONT, fill=L1_FILL, border=THIN_BORDER, alignment=CENTER_ALIGN),
+    CellStyle(font=L2_FONT, fill=L2_FILL, border=THIN_BORDER, alignment=CENTER_WRAP_ALIGN),
+    CellStyle(font=DATA_FONT, border=THIN_BORDER, alignment=DATA_ALIGN),
+    CellStyle(font=LINK_FONT, border=THIN_BORDER, alignment=DATA_ALIGN),
+    CellStyle(font=SUMMARY_LABEL_FONT),
+    CellStyle(font=DATA_FONT),
+    CellStyle(border=THIN_BORDER),
+)
+_S_L1, _S_L2, _S_DATA, _S_LINK, _S_LABEL, _S_VALUE, _S_BORDER = range(len(FAST_STYLES))
+
+
+def _fast_rows(agents: List[AgentData], data_rows: List[list], global_metrics: GlobalMetrics):
+    for label, value in _summary_items(global_metrics):
+        yield [(label, _S_LABEL), (value, _S_VALUE)]
+    # Covered cells of each L1 merge keep a border so the merged range's edges are drawn.
+    yield [(None, _S_BORDER) if name is None else (name, _S_L1) for name in L1_ROW]
+    yield [(name, _S_L2) for name in L2_NAMES]
+    for agent, values in zip(agents, data_rows):
+        row = [(value, _S_DATA) for value in values]
+        if agent.agent_link:
+            row[LINK_COL] = (agent.agent_link, _S_LINK, agent.agent_link)
+        yield row
+
+
+def _write_fast(
+    filepath: str,
+    agents: List[AgentData],
+    data_rows: List[list],
+    widths: List[float],
+    global_metrics: GlobalMetrics,
+) -> None:
+    """Write the same layout with the direct-XML writer (no openpyxl cells)."""
+    write_xlsx(
+        filepath,
+        "ACP Agents",
+        _fast_rows(agents, data_rows, global_metrics),
+        FAST_STYLES,
+        col_widths=widths,
+        merges=MERGE_RANGES,
+        freeze_rows=L2_HEADER_ROW,
+        auto_filter=_filter_ref(len(agents)),
+        compresslevel=ZIP_COMPRESSLEVEL,
+    )
+
+
+def _write_empty_report(filepath: str, global_metrics: GlobalMetrics) -> None:
+    """Summary-only sheet for runs that produced no agents (e.g. upstream failure)."""
+    rows = [[(label, _S_LABEL), (value, _S_VALUE)] for label, value in _summary_items(global_metrics)]
+    rows.append([("状态", _S_LABEL), ("未采集到 Agent 数据", _S_VALUE)])
+    write_xlsx(filepath, "ACP Agents", rows, FAST_STYLES, compresslevel=ZIP_COMPRESSLEVEL)
 
 
 def export_to_excel(
@@ -145,84 +349,23 @@ def export_to_excel(
     global_metrics: GlobalMetrics,
     output_dir: str = "./output",
     filename_prefix: str = "acp_agents",
+    fast_mode: bool = False,
 ) -> str:
-    """Export agent data to a single-sheet Excel with two-level headers."""
+    """Export agent data to a single-sheet Excel with two-level headers.
+
+    With fast_mode=True the sheet XML is streamed directly into the .xlsx
+    archive by xlsx_writer instead of going through openpyxl cells, which
+    is considerably faster for very large agent lists.
+    """
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filepath = os.path.join(output_dir, f"{filename_prefix}_{timestamp}.xlsx")
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "ACP Agents"
+    if not agents:
+        _write_empty_report(filepath, global_metrics)
+        return filepath
 
-    # -- Row 1: Level-1 headers (merged cells) --
-    col = 1
-    for l1_name, l2_fields in HEADER_STRUCTURE:
-        span = len(l2_fields)
-        start_col = col
-        end_col = col + span - 1
-        if span > 1:
-            ws.merge_cells(
-                start_row=1, start_column=start_col,
-                end_row=1, end_column=end_col,
-            )
-        cell = ws.cell(row=1, column=start_col, value=l1_name)
-        cell.font = L1_FONT
-        cell.fill = L1_FILL
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = THIN_BORDER
-        for c in range(start_col + 1, end_col + 1):
-            sc = ws.cell(row=1, column=c)
-            sc.fill = L1_FILL
-            sc.border = THIN_BORDER
-        col = end_col + 1
-
-    # -- Row 2: Level-2 headers --
-    col = 1
-    for _, l2_fields in HEADER_STRUCTURE:
-        for l2_name, _ in l2_fields:
-            cell = ws.cell(row=2, column=col, value=l2_name)
-            cell.font = L2_FONT
-            cell.fill = L2_FILL
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            cell.border = THIN_BORDER
-            col += 1
-
-    # -- Data rows (starting row 3) --
-    for row_idx, agent in enumerate(agents, 3):
-        col = 1
-        for _, l2_fields in HEADER_STRUCTURE:
-            for _, field_key in l2_fields:
-                value = _get_cell_value(agent, field_key)
-                cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-                cell.border = THIN_BORDER
-                if field_key == "agent_link" and agent.agent_link:
-                    cell.hyperlink = agent.agent_link
-                    cell.value = agent.agent_link
-                    cell.font = LINK_FONT
-                else:
-                    cell.font = DATA_FONT
-                col += 1
-
-    # -- Formatting --
-    total_cols = sum(len(fields) for _, fields in HEADER_STRUCTURE)
-
-    ws.freeze_panes = "A3"
-
-    _auto_col_widths(ws, 1, total_cols)
-
-    ws.sheet_properties.filterMode = False
-    ws.auto_filter.ref = f"A2:{get_column_letter(total_cols)}{ws.max_row}"
-
-    # -- Summary row at the bottom --
-    summary_row = ws.max_row + 2
-    ws.cell(row=summary_row, column=1, value="爬取时间").font = Font(bold=True, size=10)
-    ws.cell(row=summary_row, column=2, value=global_metrics.scrape_time).font = DATA_FONT
-    ws.cell(row=summary_row + 1, column=1, value="总 Agent 数量").font = Font(bold=True, size=10)
-    ws.cell(row=summary_row + 1, column=2, value=global_metrics.total_agents).font = DATA_FONT
-    ws.cell(row=summary_row + 2, column=1, value="平台总 AGDP").font = Font(bold=True, size=10)
-    ws.cell(row=summary_row + 2, column=2, value=f"${global_metrics.total_agdp_latest:,.2f}").font = DATA_FONT
-
-    wb.save(filepath)
+    data_rows, widths = _collect_rows(agents)
+    writer = _write_fast if fast_mode else _write_openpyxl
+    writer(filepath, agents, data_rows, widths, global_metrics)
     return filepath
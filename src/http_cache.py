@@ -0,0 +1,73 @@
+"""
+SQLite-backed store for conditional HTTP requests.
+
+Keeps the raw body of each 200 response together with its ETag /
+Last-Modified validators, so the next run can send If-None-Match /
+If-Modified-Since and reuse the stored body on 304 Not Modified.
+"""
+
+import os
+import sqlite3
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+
+class ResponseCache:
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        # Losing the cache on a crash is harmless, so skip the per-write fsync.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL)"
+        )
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        if not params:
+            return url
+        return url + "?" + urlencode(sorted(params.items()))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+            (key, etag, last_modified, body),
+        )
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+def conditional_headers(cached: Optional[CachedResponse]) -> Optional[dict]:
+    """Validator headers for a conditional GET, or None when nothing is cached."""
+    if cached is None:
+        return None
+    headers = {}
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers or None
@@ -7,6 +7,11 @@ import logging
 import sys
 import os
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.scraper import ACPScraper, load_config
@@ -20,6 +25,13 @@ logging.basicConfig(
 logger = logging.getLogger("acp-scraper")
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a uvloop event loop when uvloop is installed, else a default asyncio loop."""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
 async def run_once(config: dict) -> str:
     """Execute a single scrape run and return the output file path."""
     scraper = ACPScraper(config)
@@ -28,8 +40,9 @@ async def run_once(config: dict) -> str:
     out_cfg = config.get("output", {})
     output_dir = out_cfg.get("directory", "./output")
     prefix = out_cfg.get("filename_prefix", "acp_agents")
+    fast_mode = out_cfg.get("fast_mode", False)
 
-    filepath = export_to_excel(agents, global_metrics, output_dir, prefix)
+    filepath = export_to_excel(agents, global_metrics, output_dir, prefix, fast_mode=fast_mode)
     logger.info("Excel exported: %s", filepath)
     logger.info("Total agents: %d | Platform AGDP: $%.2f", len(agents), global_metrics.total_agdp_latest)
     return filepath
@@ -37,7 +50,10 @@ async def run_once(config: dict) -> str:
 
 def main():
     config = load_config()
-    filepath = asyncio.run(run_once(config))
+    # uvloop.run mirrors asyncio.run on a uvloop loop, without the event loop
+    # policy API that Python 3.14 deprecates.
+    run = uvloop.run if uvloop is not None else asyncio.run
+    filepath = run(run_once(config))
     print(f"\n完成！文件已保存至: {filepath}")
 
 
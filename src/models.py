@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Offering:
     name: str = ""
     description: str = ""
@@ -19,7 +19,7 @@ class Offering:
     deliverable: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentData:
     # -- Core Info --
     rank: int = 0
@@ -9,15 +9,15 @@ import time
 import schedule
 
 from .scraper import load_config
-from .main import run_once
+from .main import new_event_loop, run_once
 
 logger = logging.getLogger("acp-scheduler")
 
 
-def _job(config: dict):
+def _job(config: dict, loop: asyncio.AbstractEventLoop):
     logger.info("Scheduled scrape starting...")
     try:
-        filepath = asyncio.run(run_once(config))
+        filepath = loop.run_until_complete(run_once(config))
         logger.info("Scheduled scrape complete: %s", filepath)
     except Exception as e:
         logger.error("Scheduled scrape failed: %s", e, exc_info=True)
@@ -25,25 +25,55 @@ def _job(config: dict):
 
 def start_scheduler():
     config = load_config()
+    # One event loop for the scheduler's lifetime, instead of asyncio.run()
+    # building and tearing down a fresh loop on every tick.
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        _run_scheduler(config, loop)
+    finally:
+        _shutdown_loop(loop)
+
+
+def _shutdown_loop(loop: asyncio.AbstractEventLoop):
+    """Close `loop` the way asyncio.run() does.
+
+    Cancels leftover tasks (e.g. after Ctrl+C mid-scrape), finalizes async
+    generators and joins the default executor used by aiohttp's DNS resolver.
+    """
+    try:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def _run_scheduler(config: dict, loop: asyncio.AbstractEventLoop):
     sched_cfg = config.get("schedule", {})
 
     if not sched_cfg.get("enabled", False):
         logger.info("Scheduler is disabled in config. Running once.")
-        _job(config)
+        _job(config, loop)
         return
 
     interval_hours = sched_cfg.get("interval_hours", 24)
     run_at = sched_cfg.get("run_at", "08:00")
 
     if interval_hours == 24:
-        schedule.every().day.at(run_at).do(_job, config)
+        schedule.every().day.at(run_at).do(_job, config, loop)
         logger.info("Scheduled daily at %s", run_at)
     else:
-        schedule.every(interval_hours).hours.do(_job, config)
+        schedule.every(interval_hours).hours.do(_job, config, loop)
         logger.info("Scheduled every %d hours", interval_hours)
 
     logger.info("Running initial scrape now...")
-    _job(config)
+    _job(config, loop)
 
     logger.info("Scheduler running. Press Ctrl+C to stop.")
     try:
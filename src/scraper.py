@@ -4,14 +4,38 @@ No browser needed — pure HTTP API calls.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# aiohttp can only decode Brotli when one of these is installed, so only advertise it then.
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+from .http_cache import ResponseCache, conditional_headers
 from .models import AgentData, Offering, GlobalMetrics
 
 logger = logging.getLogger(__name__)
@@ -27,6 +51,94 @@ ENDPOINTS = {
     "agent_ratings": "/job-ratings/agents/{agent_id}",
 }
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+# Leaderboard pages requested together when the API does not report a page count.
+METRICS_PAGE_BURST = 4
+# The API caps grossAgenticAmount at this value.
+AGDP_CAP = 99_999_999.99
+
+
+def _json_dumps(obj) -> str:
+    """Compact, non-ASCII-escaped JSON; orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects integers beyond 64 bits; the stdlib writes them exactly.
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# API enum value -> Chinese label
+_CATEGORY_CN = {
+    "ON_CHAIN": "链上操作", "INFORMATION": "信息分析",
+    "FUNCTIONAL": "功能型", "SOCIAL": "社交",
+    "CREATIVE": "创意", "ENTERTAINMENT": "娱乐",
+    "DEFI": "去中心化金融", "TRADING": "交易",
+    "GAMING": "游戏", "DATA": "数据",
+    "PRODUCTIVITY": "生产力", "UTILITY": "实用工具",
+    "NONE": "未分类", "": "未分类",
+}
+_ROLE_CN = {
+    "PROVIDER": "服务提供者", "HYBRID": "混合型",
+    "CONSUMER": "消费者", "EVALUATOR": "评估者",
+    "PRODUCTIVITY": "生产力", "": "未指定",
+}
+_CLUSTER_CN = {
+    "hedgefund": "对冲基金", "trading": "交易",
+    "defi": "去中心化金融", "social": "社交",
+    "gaming": "游戏", "data": "数据分析",
+    "mediahouse": "媒体", "infrastructure": "基础设施",
+    "": "",
+}
+
+
+# Plain fallback chains for _merge_agent: (field, ((source, key), ...), default).
+# Sources are "l" (agent list), "m" (leaderboard metrics) and "d" (agent detail);
+# the first truthy value wins, otherwise the default.
+_MERGE_FIELDS = (
+    ("name", (("l", "name"), ("d", "name")), ""),
+    ("description", (("d", "description"), ("l", "description")), ""),
+    ("volume", (("m", "volume"), ("l", "grossAgenticAmount")), 0),
+    ("revenue", (("m", "revenue"),), 0),
+    ("rating", (("l", "rating"), ("d", "rating")), None),
+    ("total_jobs", (("m", "successfulJobCount"), ("d", "transactionCount"), ("l", "transactionCount")), 0),
+    ("successful_jobs", (("m", "successfulJobCount"), ("d", "successfulJobCount"), ("l", "successfulJobCount")), 0),
+    ("unique_active_wallets", (("m", "uniqueBuyerCount"), ("d", "uniqueBuyerCount"), ("l", "uniqueBuyerCount")), 0),
+    ("unique_buyers", (("m", "uniqueBuyerCount"), ("d", "uniqueBuyerCount"), ("l", "uniqueBuyerCount")), 0),
+    ("transaction_count", (("d", "transactionCount"), ("l", "transactionCount")), 0),
+    ("wallet_address", (("d", "walletAddress"), ("l", "walletAddress")), ""),
+    ("contract_address", (("d", "contractAddress"), ("l", "contractAddress")), ""),
+    ("token_address", (("d", "tokenAddress"), ("l", "tokenAddress")), ""),
+    ("owner_address", (("d", "ownerAddress"), ("l", "ownerAddress")), ""),
+    ("twitter_handle", (("d", "twitterHandle"), ("l", "twitterHandle")), ""),
+    ("symbol", (("d", "symbol"), ("l", "symbol")), ""),
+    ("profile_pic_url", (("d", "profilePic"), ("l", "profilePic")), ""),
+    ("has_graduated", (("d", "hasGraduated"), ("l", "hasGraduated")), False),
+    ("is_virtual_agent", (("d", "isVirtualAgent"), ("l", "isVirtualAgent")), False),
+    ("created_at", (("d", "createdAt"), ("l", "createdAt")), ""),
+)
+
+
+def _compile_merger():
+    """Generate `_merge_fields(l, m, d)` from _MERGE_FIELDS.
+
+    Each chain becomes an inline `src.get(key) or ... or default` expression,
+    so the table is interpreted once at import instead of on every merge.
+    """
+    lines = ["def _merge_fields(l, m, d):", "    return {"]
+    for field, chain, default in _MERGE_FIELDS:
+        expr = " or ".join(f"{src}.get({key!r})" for src, key in chain)
+        lines.append(f"        {field!r}: {expr} or {default!r},")
+    lines.append("    }")
+    ns: Dict[str, Any] = {}
+    exec("\n".join(lines), ns)
+    return ns["_merge_fields"]
+
+
+_merge_fields = _compile_merger()
+
 
 def load_config(path: str = "config.yaml") -> dict:
     try:
@@ -36,6 +148,34 @@ def load_config(path: str = "config.yaml") -> dict:
         return {}
 
 
+class RateLimiter:
+    """Async token bucket: at most `rate` acquisitions per second, bursting to `capacity`.
+
+    Use as `async with limiter:`; it only paces entry and holds nothing afterwards.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
 class ACPScraper:
     def __init__(self, config: Optional[dict] = None):
         self.config = config or load_config()
@@ -43,14 +183,63 @@ class ACPScraper:
         self.concurrency = scraper_cfg.get("concurrency", 3)
         self.delay = scraper_cfg.get("request_delay_sec", 1.5)
         self.max_retries = scraper_cfg.get("max_retries", 3)
+        self.cache_path = scraper_cfg.get("cache_path") or None
+        self.skip_complete_details = scraper_cfg.get("skip_complete_details", False)
         self.session: Optional[aiohttp.ClientSession] = None
+        self._cache: Optional[ResponseCache] = None
+        self._encoding_logged = False
+        # Per-agent URLs are built thousands of times; resolve the templates once
+        # into %-format strings.
+        self._agent_detail_url = (BASE_URL + ENDPOINTS["agent_detail"]).replace("{agent_id}", "%s")
+        self._agent_metrics_url = (BASE_URL + ENDPOINTS["agent_metrics"]).replace("{agent_id}", "%s")
+        # Global request pacing: `concurrency` requests per `delay` seconds overall,
+        # independent of how many requests are in flight.
+        if self.delay > 0:
+            self._limiter = RateLimiter(self.concurrency / self.delay, capacity=self.concurrency)
+        else:
+            self._limiter = contextlib.nullcontext()
+
+    async def _get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+    ) -> Optional[Any]:
+        """GET `url` with retries. `read(resp)` replaces the default full JSON parse.
+
+        With a response cache open, plain JSON requests are made conditional and
+        a 304 reuses the stored body. Streamed (`read`) requests bypass the cache.
+        """
+        cache = self._cache if read is None else None
+        cache_key = cached = None
+        if cache is not None:
+            cache_key = cache.key(url, params)
+            cached = cache.get(cache_key)
+        headers = conditional_headers(cached)
 
-    async def _get(self, url: str, params: Optional[dict] = None) -> Optional[dict]:
         for attempt in range(self.max_retries):
             try:
-                async with self.session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+                async with self._limiter, self.session.get(url, params=params, headers=headers) as resp:
+                    if resp.status == 304 and cached is not None:
+                        return json.loads(cached.body)
                     if resp.status == 200:
-                        return await resp.json()
+                        if not self._encoding_logged:
+                            self._encoding_logged = True
+                            logger.info(
+                                "Response Content-Encoding: %s (requested %s)",
+                                resp.headers.get("Content-Encoding", "identity"), ACCEPT_ENCODING,
+                            )
+                        if read is not None:
+                            return await read(resp)
+                        body = await resp.read()
+                        # stdlib json on purpose: orjson turns integers beyond 64 bits
+                        # (e.g. wei balances) into floats.
+                        data = json.loads(body)
+                        etag = resp.headers.get("ETag")
+                        last_modified = resp.headers.get("Last-Modified")
+                        if cache is not None and (etag or last_modified):
+                            cache.put(cache_key, etag, last_modified, body)
+                        return data
                     logger.warning("HTTP %d for %s (attempt %d)", resp.status, url, attempt + 1)
             except Exception as e:
                 logger.warning("Request error for %s: %s (attempt %d)", url, e, attempt + 1)
@@ -72,8 +261,7 @@ class ACPScraper:
             return result["data"]
         return []
 
-    async def fetch_metrics_leaderboard(self, page: int = 1, page_size: int = 100) -> List[dict]:
-        """Fetch agent leaderboard with volume/revenue metrics."""
+    async def _fetch_metrics_page(self, page: int, page_size: int) -> Optional[dict]:
         url = BASE_URL + ENDPOINTS["metrics_agents"]
         params = {
             "page": page,
@@ -81,33 +269,62 @@ class ACPScraper:
             "sortBy": "volume",
             "sortOrder": "desc",
         }
-        result = await self._get(url, params)
+        return await self._get(url, params)
+
+    async def fetch_metrics_leaderboard(self, page: int = 1, page_size: int = 100) -> List[dict]:
+        """Fetch agent leaderboard with volume/revenue metrics."""
+        result = await self._fetch_metrics_page(page, page_size)
         if result and "data" in result:
             return result["data"]
         return []
 
     async def fetch_all_metrics_pages(self) -> List[dict]:
-        """Paginate through the metrics leaderboard to get all agents."""
-        all_agents = []
-        page = 1
+        """Paginate through the metrics leaderboard to get all agents.
+
+        Page 1 is fetched alone; if it reports a page count the rest are
+        fetched concurrently, otherwise in bursts until a short page.
+        """
         page_size = 100
-        while True:
-            batch = await self.fetch_metrics_leaderboard(page, page_size)
-            if not batch:
-                break
-            all_agents.extend(batch)
-            logger.info("Metrics leaderboard page %d: got %d agents (total %d)", page, len(batch), len(all_agents))
-            if len(batch) < page_size:
-                break
-            page += 1
-            await asyncio.sleep(self.delay)
+        first = await self._fetch_metrics_page(1, page_size) or {}
+        all_agents = list(first.get("data") or [])
+        logger.info("Metrics leaderboard page 1: got %d agents", len(all_agents))
+        if len(all_agents) < page_size:
+            return all_agents
+
+        pagination = (first.get("meta") or {}).get("pagination") or {}
+        page_count = pagination.get("pageCount")
+        if page_count:
+            batches = await asyncio.gather(
+                *(self.fetch_metrics_leaderboard(p, page_size) for p in range(2, page_count + 1))
+            )
+            for batch in batches:
+                all_agents.extend(batch)
+        else:
+            page = 2
+            done = False
+            while not done:
+                pages = range(page, page + METRICS_PAGE_BURST)
+                batches = await asyncio.gather(*(self.fetch_metrics_leaderboard(p, page_size) for p in pages))
+                for batch in batches:
+                    all_agents.extend(batch)
+                    if len(batch) < page_size:
+                        done = True
+                        break
+                page += METRICS_PAGE_BURST
+        logger.info("Metrics leaderboard: %d agents total", len(all_agents))
         return all_agents
 
     async def fetch_global_metrics(self) -> GlobalMetrics:
         """Fetch platform-level four-metrics."""
         url = BASE_URL + ENDPOINTS["four_metrics"]
-        result = await self._get(url)
         gm = GlobalMetrics(scrape_time=datetime.now().isoformat())
+        if ijson is not None:
+            latest = await self._get(url, read=_read_latest_gav)
+            if latest:
+                gm.total_agdp_latest = latest.get("value", 0)
+            return gm
+
+        result = await self._get(url)
         if result and "data" in result:
             data = result["data"].get("result", {})
             gav = data.get("GAV", {})
@@ -118,7 +335,7 @@ class ACPScraper:
 
     async def fetch_agent_detail(self, agent_id: int) -> Optional[dict]:
         """Fetch detailed info for a single agent."""
-        url = BASE_URL + ENDPOINTS["agent_detail"].format(agent_id=agent_id)
+        url = self._agent_detail_url % agent_id
         result = await self._get(url)
         if result and "data" in result:
             return result["data"]
@@ -126,7 +343,7 @@ class ACPScraper:
 
     async def fetch_agent_metrics(self, agent_id: int) -> Optional[dict]:
         """Fetch metrics (volume, revenue, 7d data) for a single agent."""
-        url = BASE_URL + ENDPOINTS["agent_metrics"].format(agent_id=agent_id)
+        url = self._agent_metrics_url % agent_id
         result = await self._get(url)
         if result and "data" in result:
             return result["data"]
@@ -135,18 +352,21 @@ class ACPScraper:
     @staticmethod
     def _fix_capped_agdp(gross_agdp: float, volume: float) -> float:
         """API caps grossAgenticAmount at 99,999,999.99; fall back to volume when hit."""
-        AGDP_CAP = 99_999_999.99
-        if float(gross_agdp) >= AGDP_CAP and float(volume) > AGDP_CAP:
-            return float(volume)
-        return float(gross_agdp)
+        gross_agdp = float(gross_agdp)
+        if gross_agdp >= AGDP_CAP:
+            volume = float(volume)
+            if volume > AGDP_CAP:
+                return volume
+        return gross_agdp
 
-    def _parse_offerings(self, jobs_raw: list) -> List[Offering]:
+    @staticmethod
+    def _parse_offerings(jobs_raw: list) -> List[Offering]:
         offerings = []
         for j in (jobs_raw or []):
             req = j.get("requirement", {})
-            req_str = json.dumps(req, ensure_ascii=False) if isinstance(req, dict) else str(req)
+            req_str = _json_dumps(req) if isinstance(req, dict) else str(req)
             dlv = j.get("deliverable", {})
-            dlv_str = json.dumps(dlv, ensure_ascii=False) if isinstance(dlv, dict) else str(dlv)
+            dlv_str = _json_dumps(dlv) if isinstance(dlv, dict) else str(dlv)
             price_v2 = j.get("priceV2", {}) or {}
             offerings.append(Offering(
                 name=j.get("name", ""),
@@ -161,8 +381,8 @@ class ACPScraper:
             ))
         return offerings
 
+    @staticmethod
     def _merge_agent(
-        self,
         rank: int,
         list_data: dict,
         metrics_data: Optional[dict],
@@ -186,134 +406,146 @@ class ACPScraper:
 
         agent_id = l.get("id") or d.get("id", 0)
 
-        CATEGORY_CN = {
-            "ON_CHAIN": "链上操作", "INFORMATION": "信息分析",
-            "FUNCTIONAL": "功能型", "SOCIAL": "社交",
-            "CREATIVE": "创意", "ENTERTAINMENT": "娱乐",
-            "DEFI": "去中心化金融", "TRADING": "交易",
-            "GAMING": "游戏", "DATA": "数据",
-            "PRODUCTIVITY": "生产力", "UTILITY": "实用工具",
-            "NONE": "未分类", "": "未分类",
-        }
-        ROLE_CN = {
-            "PROVIDER": "服务提供者", "HYBRID": "混合型",
-            "CONSUMER": "消费者", "EVALUATOR": "评估者",
-            "PRODUCTIVITY": "生产力", "": "未指定",
-        }
-        CLUSTER_CN = {
-            "hedgefund": "对冲基金", "trading": "交易",
-            "defi": "去中心化金融", "social": "社交",
-            "gaming": "游戏", "data": "数据分析",
-            "mediahouse": "媒体", "infrastructure": "基础设施",
-            "": "",
-        }
-
         raw_category = str(l.get("category") or d.get("category") or "").strip()
         raw_role = str(d.get("role") or l.get("role") or "").strip()
         raw_cluster = str(d.get("cluster") or l.get("cluster") or "").strip()
         if raw_cluster == "None":
             raw_cluster = ""
 
+        fields = _merge_fields(l, m, d)
+        success_rate = float(m.get("successRate") or d.get("successRate") or l.get("successRate") or 0)
+        success_rate = 0.0 if success_rate < 0 else 100.0 if success_rate > 100 else success_rate
+
         return AgentData(
             rank=rank,
             agent_id=agent_id,
             agent_link=f"https://app.virtuals.io/acp/agent-details/{agent_id}",
-            name=l.get("name") or d.get("name", ""),
-            category=CATEGORY_CN.get(raw_category, raw_category),
-            description=d.get("description") or l.get("description") or "",
-            volume=m.get("volume") or l.get("grossAgenticAmount", 0) or 0,
-            gross_agdp=self._fix_capped_agdp(
+            category=_CATEGORY_CN.get(raw_category, raw_category),
+            gross_agdp=ACPScraper._fix_capped_agdp(
                 m.get("grossAgenticAmount") or l.get("grossAgenticAmount", 0) or 0,
-                m.get("volume") or l.get("grossAgenticAmount", 0) or 0,
+                fields["volume"],
             ),
-            revenue=m.get("revenue", 0) or 0,
-            success_rate=min(max(float(m.get("successRate") or d.get("successRate") or l.get("successRate", 0) or 0), 0), 100),
-            rating=l.get("rating") or d.get("rating"),
-            total_jobs=m.get("successfulJobCount") or d.get("transactionCount") or l.get("transactionCount", 0) or 0,
-            successful_jobs=m.get("successfulJobCount") or d.get("successfulJobCount") or l.get("successfulJobCount", 0) or 0,
-            unique_active_wallets=m.get("uniqueBuyerCount") or d.get("uniqueBuyerCount") or l.get("uniqueBuyerCount", 0) or 0,
-            unique_buyers=m.get("uniqueBuyerCount") or d.get("uniqueBuyerCount") or l.get("uniqueBuyerCount", 0) or 0,
+            success_rate=success_rate,
             online_status=online_status,
             last_active_at=last_active if not last_active.startswith("2999") else "始终在线",
-            transaction_count=d.get("transactionCount") or l.get("transactionCount", 0) or 0,
-            offerings=self._parse_offerings(jobs_raw),
-            wallet_address=d.get("walletAddress") or l.get("walletAddress", ""),
-            contract_address=d.get("contractAddress") or l.get("contractAddress", ""),
-            token_address=d.get("tokenAddress") or l.get("tokenAddress", ""),
-            owner_address=d.get("ownerAddress") or l.get("ownerAddress", ""),
-            twitter_handle=d.get("twitterHandle") or l.get("twitterHandle") or "",
-            symbol=d.get("symbol") or l.get("symbol") or "",
-            profile_pic_url=d.get("profilePic") or l.get("profilePic", ""),
-            role=ROLE_CN.get(raw_role, raw_role),
-            cluster=CLUSTER_CN.get(raw_cluster, raw_cluster),
-            has_graduated=d.get("hasGraduated", False) or l.get("hasGraduated", False),
+            offerings=ACPScraper._parse_offerings(jobs_raw),
+            role=_ROLE_CN.get(raw_role, raw_role),
+            cluster=_CLUSTER_CN.get(raw_cluster, raw_cluster),
             wallet_balance=str(d.get("walletBalance") or l.get("walletBalance") or ""),
             enabled_chains=chains_str,
             virtual_agent_id=str(d.get("virtualAgentId") or l.get("virtualAgentId") or ""),
-            is_virtual_agent=d.get("isVirtualAgent", False) or l.get("isVirtualAgent", False),
-            created_at=d.get("createdAt") or l.get("createdAt") or "",
+            **fields,
         )
 
     async def scrape_all(self) -> Tuple[List[AgentData], GlobalMetrics]:
         """Main entry: scrape everything and return merged data."""
-        async with aiohttp.ClientSession() as session:
-            self.session = session
-
-            logger.info("Fetching global metrics...")
-            global_metrics = await self.fetch_global_metrics()
-
-            logger.info("Fetching agent list...")
-            agents_list = await self.fetch_all_agents()
-
-            logger.info("Fetching metrics leaderboard (all pages)...")
-            metrics_list = await self.fetch_all_metrics_pages()
-
-            metrics_map: Dict[int, dict] = {a["id"]: a for a in metrics_list}
-            agents_map: Dict[int, dict] = {a["id"]: a for a in agents_list}
-
-            all_ids = sorted(set(list(agents_map.keys()) + list(metrics_map.keys())))
-            global_metrics.total_agents = len(all_ids)
-            logger.info("Total unique agents: %d", len(all_ids))
-
-            semaphore = asyncio.Semaphore(self.concurrency)
-
-            async def fetch_detail_throttled(aid: int) -> Tuple[int, Optional[dict], Optional[dict]]:
-                async with semaphore:
-                    detail = await self.fetch_agent_detail(aid)
-                    await asyncio.sleep(self.delay)
-                    metrics = await self.fetch_agent_metrics(aid)
-                    await asyncio.sleep(self.delay)
-                    return aid, detail, metrics
-
-            logger.info("Fetching details for %d agents (concurrency=%d)...", len(all_ids), self.concurrency)
-            tasks = [fetch_detail_throttled(aid) for aid in all_ids]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            detail_map: Dict[int, dict] = {}
-            ind_metrics_map: Dict[int, dict] = {}
-            for r in results:
-                if isinstance(r, Exception):
-                    logger.error("Detail fetch error: %s", r)
-                    continue
-                aid, detail, ind_metrics = r
-                if detail:
-                    detail_map[aid] = detail
-                if ind_metrics:
-                    ind_metrics_map[aid] = ind_metrics
-
-            sorted_ids = sorted(
-                all_ids,
-                key=lambda x: (ind_metrics_map.get(x, {}).get("volume", 0) or metrics_map.get(x, {}).get("volume", 0) or 0),
-                reverse=True,
-            )
-
-            agent_data_list: List[AgentData] = []
-            for rank, aid in enumerate(sorted_ids, 1):
-                list_entry = agents_map.get(aid, {"id": aid})
-                merged_metrics = ind_metrics_map.get(aid) or metrics_map.get(aid)
-                detail = detail_map.get(aid)
-                agent = self._merge_agent(rank, list_entry, merged_metrics, detail)
-                agent_data_list.append(agent)
-
-            logger.info("Scraping complete. Total agents: %d", len(agent_data_list))
-            return agent_data_list, global_metrics
+        # Every request goes to one host: keep a warm keep-alive pool and cache DNS
+        # so connections (and TLS handshakes) are reused across requests.
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            ttl_dns_cache=600,
+            keepalive_timeout=60,
+        )
+        cache = ResponseCache(self.cache_path) if self.cache_path else contextlib.nullcontext()
+        with cache as self._cache:
+            async with aiohttp.ClientSession(
+                connector=connector,
+                timeout=REQUEST_TIMEOUT,
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+            ) as session:
+                self.session = session
+
+                logger.info("Fetching global metrics...")
+                global_metrics = await self.fetch_global_metrics()
+
+                logger.info("Fetching agent list...")
+                agents_list = await self.fetch_all_agents()
+
+                logger.info("Fetching metrics leaderboard (all pages)...")
+                metrics_list = await self.fetch_all_metrics_pages()
+
+                metrics_map: Dict[int, dict] = {a["id"]: a for a in metrics_list}
+                agents_map: Dict[int, dict] = {a["id"]: a for a in agents_list}
+
+                all_ids = list(agents_map.keys() | metrics_map.keys())
+                global_metrics.total_agents = len(all_ids)
+                logger.info("Total unique agents: %d", len(all_ids))
+
+                fetch_ids = all_ids
+                if self.skip_complete_details:
+                    fetch_ids = [aid for aid in all_ids if _needs_detail(agents_map.get(aid), metrics_map.get(aid))]
+                    logger.info("Skipping detail fetch for %d agents complete in list data", len(all_ids) - len(fetch_ids))
+
+                queue: asyncio.Queue = asyncio.Queue()
+                for aid in fetch_ids:
+                    queue.put_nowait(aid)
+                detail_map: Dict[int, dict] = {}
+                ind_metrics_map: Dict[int, dict] = {}
+
+                async def detail_worker() -> None:
+                    # Detail and metrics are independent, so each worker issues both at once
+                    # (up to 2 x concurrency requests in flight; the limiter sets the rate).
+                    while True:
+                        try:
+                            aid = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        try:
+                            detail, ind_metrics = await asyncio.gather(
+                                self.fetch_agent_detail(aid),
+                                self.fetch_agent_metrics(aid),
+                            )
+                        except Exception as e:
+                            logger.error("Detail fetch error for agent %s: %s", aid, e)
+                            continue
+                        if detail:
+                            detail_map[aid] = detail
+                        if ind_metrics:
+                            ind_metrics_map[aid] = ind_metrics
+
+                logger.info("Fetching details for %d agents (concurrency=%d)...", len(fetch_ids), self.concurrency)
+                await asyncio.gather(*(detail_worker() for _ in range(min(self.concurrency, len(fetch_ids)))))
+
+                # Volume descending, ties by agent id: sort flat (-volume, id) tuples in
+                # place, with no key function and no per-lookup empty dicts.
+                empty: dict = {}
+                pairs = [
+                    (-(ind_metrics_map.get(aid, empty).get("volume") or metrics_map.get(aid, empty).get("volume") or 0), aid)
+                    for aid in all_ids
+                ]
+                pairs.sort()
+                sorted_ids = [aid for _, aid in pairs]
+
+                merge_jobs = [
+                    (rank, agents_map.get(aid, {"id": aid}), ind_metrics_map.get(aid) or metrics_map.get(aid), detail_map.get(aid))
+                    for rank, aid in enumerate(sorted_ids, 1)
+                ]
+                agent_data_list = _merge_batch(merge_jobs)
+
+                logger.info("Scraping complete. Total agents: %d", len(agent_data_list))
+                return agent_data_list, global_metrics
+
+
+def _needs_detail(list_entry: Optional[dict], metrics_entry: Optional[dict]) -> bool:
+    """Whether an agent still needs its /details and per-agent metrics requests.
+
+    Agents whose list entry already carries offerings and a wallet, and which
+    appear on the leaderboard, can be merged from list + leaderboard data alone.
+    """
+    if not list_entry or not metrics_entry:
+        return True
+    return not (list_entry.get("offerings") and list_entry.get("walletAddress"))
+
+
+async def _read_latest_gav(resp: aiohttp.ClientResponse) -> dict:
+    """Stream the four-metrics body and keep only the last 7D GAV point."""
+    last: dict = {}
+    async for item in ijson.items_async(resp.content, "data.result.GAV.7D.item", use_float=True):
+        last = item
+    return last
+
+
+def _merge_batch(merge_jobs: List[tuple]) -> List[AgentData]:
+    """Merge (rank, list, metrics, detail) tuples in order."""
+    return [ACPScraper._merge_agent(*job) for job in merge_jobs]
@@ -0,0 +1,234 @@
+"""
+Minimal streaming .xlsx writer for large exports.
+
+Writes a single-sheet workbook straight into the zip archive, bypassing
+openpyxl's Cell/Style machinery. Only what the Excel exporter needs is
+supported: inline strings and numbers, a fixed set of cell styles, merged
+cells, frozen header rows, an autofilter, column widths and external
+hyperlinks. Style objects are openpyxl's own, serialized once via to_tree().
+"""
+
+import math
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.styles import Alignment, Border, Font, PatternFill
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fills import DEFAULT_EMPTY_FILL, DEFAULT_GRAY_FILL
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+from openpyxl.xml.functions import tostring
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+CONTENT_TYPES_XML = XML_DECL + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+ROOT_RELS_XML = XML_DECL + (
+    f'<Relationships xmlns="{PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_RELS_XML = XML_DECL + (
+    f'<Relationships xmlns="{PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Characters XML 1.0 cannot carry; openpyxl rejects them, we drop them.
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+@dataclass(frozen=True)
+class CellStyle:
+    font: Optional[Font] = None
+    fill: Optional[PatternFill] = None
+    border: Optional[Border] = None
+    alignment: Optional[Alignment] = None
+
+
+# A cell is (value, style_index) or (value, style_index, hyperlink); None skips it.
+Cell = Tuple
+
+
+def _register(items: List[bytes], obj) -> int:
+    xml = tostring(obj.to_tree())
+    if xml not in items:
+        items.append(xml)
+    return items.index(xml)
+
+
+def _styles_xml(styles: Sequence[CellStyle]) -> str:
+    fonts = [tostring(DEFAULT_FONT.to_tree())]
+    fills = [tostring(DEFAULT_EMPTY_FILL.to_tree()), tostring(DEFAULT_GRAY_FILL.to_tree())]
+    borders = [tostring(DEFAULT_BORDER.to_tree())]
+    xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+    for style in styles:
+        attrs = ['numFmtId="0"', 'xfId="0"']
+        for name, obj, items in (
+            ("font", style.font, fonts),
+            ("fill", style.fill, fills),
+            ("border", style.border, borders),
+        ):
+            if obj is None:
+                attrs.append(f'{name}Id="0"')
+            else:
+                attrs.append(f'{name}Id="{_register(items, obj)}" apply{name.capitalize()}="1"')
+        if style.alignment is None:
+            xfs.append(f'<xf {" ".join(attrs)}/>')
+        else:
+            align = tostring(style.alignment.to_tree()).decode()
+            xfs.append(f'<xf {" ".join(attrs)} applyAlignment="1">{align}</xf>')
+
+    def section(tag: str, items) -> str:
+        body = "".join(i.decode() if isinstance(i, bytes) else i for i in items)
+        return f'<{tag} count="{len(items)}">{body}</{tag}>'
+
+    return XML_DECL + (
+        f'<styleSheet xmlns="{MAIN_NS}">'
+        + section("fonts", fonts)
+        + section("fills", fills)
+        + section("borders", borders)
+        + '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        + section("cellXfs", xfs)
+        + '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        + '</styleSheet>'
+    )
+
+
+def _workbook_xml(sheet_name: str, auto_filter: Optional[str]) -> str:
+    defined_names = ""
+    if auto_filter:
+        start, _, end = auto_filter.partition(":")
+        ref = "$" + re.sub(r"(\d+)", r"$\1", start) + ":$" + re.sub(r"(\d+)", r"$\1", end)
+        sheet_ref = "'" + sheet_name.replace("'", "''") + "'"
+        defined_names = (
+            '<definedNames><definedName name="_xlnm._FilterDatabase" localSheetId="0" hidden="1">'
+            f"{escape(sheet_ref)}!{ref}</definedName></definedNames>"
+        )
+    return XML_DECL + (
+        f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+        f'<sheets><sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/></sheets>'
+        f"{defined_names}</workbook>"
+    )
+
+
+def _cell_xml(ref: str, value, style: int) -> str:
+    if value is None or value == "":
+        return f'<c r="{ref}" s="{style}"/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" s="{style}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        # NaN/inf have no SpreadsheetML literal; write an empty cell like openpyxl does.
+        if isinstance(value, float) and not math.isfinite(value):
+            return f'<c r="{ref}" s="{style}"/>'
+        return f'<c r="{ref}" s="{style}"><v>{value!r}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def write_xlsx(
+    filepath: str,
+    sheet_name: str,
+    rows: Iterable[Sequence[Optional[Cell]]],
+    styles: Sequence[CellStyle],
+    col_widths: Sequence[float] = (),
+    merges: Sequence[str] = (),
+    freeze_rows: int = 0,
+    auto_filter: Optional[str] = None,
+    compresslevel: Optional[int] = None,
+) -> str:
+    """Stream `rows` into a single-sheet workbook at `filepath`.
+
+    Cell style indexes refer to positions in `styles`.
+    """
+    letters = [get_column_letter(i) for i in range(1, len(col_widths) + 1)]
+    hyperlinks: List[Tuple[str, str]] = []
+
+    with zipfile.ZipFile(
+        filepath, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel
+    ) as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", ROOT_RELS_XML)
+        zf.writestr("xl/workbook.xml", _workbook_xml(sheet_name, auto_filter))
+        zf.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS_XML)
+        zf.writestr("xl/styles.xml", _styles_xml(styles))
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as f:
+            head = [XML_DECL, f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">', "<sheetViews>"]
+            if freeze_rows:
+                top_left = f"A{freeze_rows + 1}"
+                head.append(
+                    '<sheetView workbookViewId="0">'
+                    f'<pane ySplit="{freeze_rows}" topLeftCell="{top_left}" activePane="bottomLeft" state="frozen"/>'
+                    f'<selection pane="bottomLeft" activeCell="{top_left}" sqref="{top_left}"/>'
+                    "</sheetView>"
+                )
+            else:
+                head.append('<sheetView workbookViewId="0"/>')
+            head.append('</sheetViews><sheetFormatPr defaultRowHeight="15"/>')
+            if col_widths:
+                head.append("<cols>")
+                for i, width in enumerate(col_widths, 1):
+                    head.append(f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>')
+                head.append("</cols>")
+            head.append("<sheetData>")
+            f.write("".join(head).encode("utf-8"))
+
+            for row_idx, row in enumerate(rows, 1):
+                parts = [f'<row r="{row_idx}">']
+                for col_idx, cell in enumerate(row):
+                    if cell is None:
+                        continue
+                    if col_idx >= len(letters):
+                        letters.append(get_column_letter(col_idx + 1))
+                    ref = f"{letters[col_idx]}{row_idx}"
+                    parts.append(_cell_xml(ref, cell[0], cell[1] + 1))
+                    if len(cell) > 2 and cell[2]:
+                        hyperlinks.append((ref, cell[2]))
+                parts.append("</row>")
+                f.write("".join(parts).encode("utf-8"))
+
+            tail = ["</sheetData>"]
+            if auto_filter:
+                tail.append(f'<autoFilter ref="{auto_filter}"/>')
+            if merges:
+                tail.append(f'<mergeCells count="{len(merges)}">')
+                tail.extend(f'<mergeCell ref="{ref}"/>' for ref in merges)
+                tail.append("</mergeCells>")
+            if hyperlinks:
+                tail.append("<hyperlinks>")
+                tail.extend(
+                    f'<hyperlink ref="{ref}" r:id="rId{i}"/>' for i, (ref, _) in enumerate(hyperlinks, 1)
+                )
+                tail.append("</hyperlinks>")
+            tail.append("</worksheet>")
+            f.write("".join(tail).encode("utf-8"))
+
+        if hyperlinks:
+            rels = [XML_DECL, f'<Relationships xmlns="{PKG_REL_NS}">']
+            rels.extend(
+                f'<Relationship Id="rId{i}" Type="{REL_NS}/hyperlink" '
+                f'Target={quoteattr(target)} TargetMode="External"/>'
+                for i, (_, target) in enumerate(hyperlinks, 1)
+            )
+            rels.append("</Relationships>")
+            zf.writestr("xl/worksheets/_rels/sheet1.xml.rels", "".join(rels))
+
+    return filepath